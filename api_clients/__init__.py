@@ -0,0 +1,3 @@
+"""
+News API client modules: API configuration, quota management and the base fetcher
+"""
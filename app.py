@@ -7,7 +7,7 @@ with sentiment analysis and summarization.
 import os
 import sys
 import logging
-import pkg_resources
+from importlib import metadata
 import time
 from logging.config import dictConfig
 from dotenv import load_dotenv
@@ -27,7 +27,7 @@ logger.info(f"[IMPORT_SEQUENCE] {time.time()} - Starting app.py before any modul
 
 # Log installed packages
 logger.info("[PACKAGES] Installed packages:")
-installed_packages = [f"{dist.key} {dist.version}" for dist in pkg_resources.working_set]
+installed_packages = [f"{dist.metadata['Name']} {dist.version}" for dist in metadata.distributions()]
 logger.info("\n".join(installed_packages))
 
 # Log requirements.txt content
@@ -134,10 +134,10 @@ def create_app():
     # Log Python and package versions
     try:
         logger.info(f"[APP_INIT] Python version: {sys.version}")
-        logger.info(f"[APP_INIT] Flask version: {pkg_resources.get_distribution('flask').version}")
-        logger.info(f"[APP_INIT] pytrends version: {pkg_resources.get_distribution('pytrends').version}")
-        logger.info(f"[APP_INIT] requests version: {pkg_resources.get_distribution('requests').version}")
-        logger.info(f"[APP_INIT] urllib3 version: {pkg_resources.get_distribution('urllib3').version}")
+        logger.info(f"[APP_INIT] Flask version: {metadata.version('flask')}")
+        logger.info(f"[APP_INIT] aiohttp version: {metadata.version('aiohttp')}")
+        logger.info(f"[APP_INIT] requests version: {metadata.version('requests')}")
+        logger.info(f"[APP_INIT] urllib3 version: {metadata.version('urllib3')}")
     except Exception as e:
         logger.error(f"[APP_INIT] Error logging package versions: {e}")
 
@@ -197,6 +197,7 @@ def create_app():
             GNEWS_ENDPOINT='https://gnews.io/api/v4',
             MODEL_NAME='distilbert-base-uncased-finetuned-sst-2-english',
             MAX_ARTICLES_PER_API=4,
+            MAX_ARTICLES_PER_SOURCE=10,
             DEFAULT_TOP_N=3,
             DEFAULT_DAYS_BACK=7,
             SUMMARIZER_BY_GPT=1
@@ -224,6 +225,15 @@ def create_app():
     except Exception as e:
         logger.error(f"[API_AVAILABILITY] Error logging API availability: {e}")
 
+    # Set up the shared cache
+    try:
+        from config import cache, CACHE_CONFIG
+        cache.init_app(app, config=CACHE_CONFIG)
+        logger.info(f"[APP_INIT] Cache initialized with backend {CACHE_CONFIG['CACHE_TYPE']}")
+    except Exception as e:
+        logger.error(f"[APP_INIT] Failed to initialize cache: {e}")
+        raise
+
     # Register error handlers
     try:
         @app.errorhandler(404)
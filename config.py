@@ -105,7 +105,8 @@ class ProductionConfig(Config):
         'CACHE_DEFAULT_TIMEOUT': 1800
     }
 
-# cache = Cache(config={'CACHE_TYPE': 'SimpleCache'})  # Temporarily disabled for faster builds
+# Shared cache, bound to the Flask app with CACHE_CONFIG in create_app()
+cache = Cache()
 
 
 # API Endpoints
@@ -131,8 +132,22 @@ SUMMARIZER_BY_GPT = 1
 WEIGHT_RELEVANCE = 0.7
 WEIGHT_POPULARITY = 0.3
 
-# Cache configuration
-CACHE_CONFIG = {
-    'CACHE_TYPE': 'SimpleCache',
-    'CACHE_DEFAULT_TIMEOUT': 1800  # 30 minutes
-}
+# Cache configuration: Redis when REDIS_URL is set, so every worker shares one cache
+# and entries survive restarts; otherwise a process-local SimpleCache
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    import redis
+    # Pass a pre-built client so the connection pool is bounded and idle sockets are kept alive;
+    # flask-caching would otherwise build its own client from CACHE_REDIS_URL with default options
+    CACHE_CONFIG = {
+        'CACHE_TYPE': 'RedisCache',
+        'CACHE_REDIS_HOST': redis.Redis.from_url(REDIS_URL, socket_keepalive=True, max_connections=20),
+        'CACHE_KEY_PREFIX': 'nn:',
+        'CACHE_DEFAULT_TIMEOUT': 3600  # 1 hour
+    }
+else:
+    CACHE_CONFIG = {
+        'CACHE_TYPE': 'SimpleCache',
+        'CACHE_DEFAULT_TIMEOUT': 1800  # 30 minutes
+    }
+
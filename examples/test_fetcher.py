@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from app.fetchers.base import BaseFetcher
+from api_clients.fetchers.base import BaseFetcher
 
 # Configure logging
 logging.basicConfig(
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 import os
-from app.fetchers.base import BaseFetcher
+from api_clients.fetchers.base import BaseFetcher
 from flask import current_app
 import requests
 import json
@@ -35,6 +35,13 @@ finally:
 # Track configuration access attempts
 config_access_attempts = {}
 
+# Shared HTTP session so repeated calls to the same news API reuse pooled keep-alive
+# connections instead of paying a new TCP+TLS handshake per request
+http_session = requests.Session()
+http_adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16)
+http_session.mount('http://', http_adapter)
+http_session.mount('https://', http_adapter)
+
 def get_config(key, default=None):
     """Helper function to safely get config values"""
     try:
@@ -77,7 +84,7 @@ def fetch_newsapi_org(event, days_back=None):
     logger.info(f"NewsAPI.org: Requesting articles for '{event}' from {from_date}")
     
     try:
-        response = requests.get(url, timeout=5)
+        response = http_session.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             articles = data.get('articles', [])
@@ -104,7 +111,7 @@ def fetch_guardian(event, days_back=None):
     url = f"https://content.guardianapis.com/search?q={event}&from-date={from_date}&page-size={max_articles}&api-key={api_key}"
     
     try:
-        response = requests.get(url, timeout=5)
+        response = http_session.get(url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             articles = data.get('response', {}).get('results', [])
@@ -204,7 +211,7 @@ def fetch_gnews_articles(event, api_key=None, days_back=None):
     url = f"https://gnews.io/api/v4/search?q={event}&from={from_date}&token={api_key}&max={get_config('MAX_ARTICLES_PER_API', 4)}"
     try:
         logger.info(f"GNews: Making request to API for event '{event}'")
-        response = requests.get(url, timeout=5)  # 5 seconds timeout
+        response = http_session.get(url, timeout=5)  # 5 seconds timeout
         if response.status_code == 200:
             data = response.json()
             articles_count = len(data.get('articles', []))
@@ -241,7 +248,7 @@ def fetch_nyt_articles(event, api_key=None, days_back=None):
     url = f"https://api.nytimes.com/svc/search/v2/articlesearch.json?q={event}&api-key={api_key}&begin_date={from_date}&page-size={get_config('MAX_ARTICLES_PER_API', 4)}"
     try:
         logger.info(f"NYT: Making request to {url} for event '{event}'")
-        response = requests.get(url, timeout=5)  # 5 seconds timeout
+        response = http_session.get(url, timeout=5)  # 5 seconds timeout
         if response.status_code == 200:
             data = response.json()
             articles = data.get('response', {}).get('docs', [])
@@ -272,7 +279,7 @@ def fetch_mediastack_articles(event, api_key=None, days_back=None):
     url = f"http://api.mediastack.com/v1/news?access_key={api_key}&keywords={event}&date={from_date}&languages=en&limit={get_config('MAX_ARTICLES_PER_API', 4)}"
     try:
         logger.info(f"Mediastack: Making request to API for event '{event}'")
-        response = requests.get(url, timeout=5)  # 5 seconds timeout
+        response = http_session.get(url, timeout=5)  # 5 seconds timeout
         if response.status_code == 200:
             data = response.json()
             # Check for rate limit error in the response
@@ -325,7 +332,7 @@ def fetch_newsapi_ai_articles(event, api_key=None, days_back=None):
     }
     try:
         logger.info(f"NewsAPI.ai: Making request to API for event '{event}' with params: {params}")
-        response = requests.get(url, params=params, timeout=5)  # 5 seconds timeout
+        response = http_session.get(url, params=params, timeout=5)  # 5 seconds timeout
         if response.status_code == 200:
             data = response.json()
             articles = data.get('articles', {}).get('results', [])
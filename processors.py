@@ -9,6 +9,7 @@ import logging
 import requests
 import inspect
 import time
+import threading
 import os
 from transformers import pipeline
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -38,10 +39,22 @@ finally:
 # Track configuration access attempts
 config_access_attempts = {}
 
+# Near-duplicate detection: word shingle length and the share of an article's shingles
+# already seen in earlier articles above which it is dropped as a duplicate
+SHINGLE_SIZE = 13
+DUPLICATE_SHINGLE_RATIO = 0.8
+
+# Prefix of the summary returned when summarization fails, so callers can tell it from a real summary
+SUMMARY_ERROR_PREFIX = "Error generating summary"
+
 class ModelManager:
     _instance = None
     _summarizer = None
     _sentiment_analyzer = None
+    _summarizer_last_used = 0.0
+    _idle_timer = None
+    _idle_lock = threading.Lock()
+    SUMMARIZER_IDLE_SECONDS = 300  # Unload the summarizer after this long without use
 
     @classmethod
     def get_instance(cls):
@@ -55,6 +68,9 @@ class ModelManager:
         if self._summarizer is None:
             logger.info("Loading summarization model...")
             self._summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+        with self._idle_lock:
+            self._summarizer_last_used = time.monotonic()
+            self._schedule_idle_check(self.SUMMARIZER_IDLE_SECONDS)
         return self._summarizer
 
     def get_sentiment_analyzer(self):
@@ -66,6 +82,26 @@ class ModelManager:
         # Keep _sentiment_analyzer loaded to avoid reload overhead
         torch.cuda.empty_cache() if torch.cuda.is_available() else None
 
+    def clear_if_idle(self, threshold_seconds=None):
+        """Clear the summarizer once it has gone unused for threshold_seconds, otherwise check again later."""
+        threshold_seconds = threshold_seconds or self.SUMMARIZER_IDLE_SECONDS
+        with self._idle_lock:
+            self._idle_timer = None
+            if self._summarizer is None:
+                return
+            idle_seconds = time.monotonic() - self._summarizer_last_used
+            if idle_seconds < threshold_seconds:
+                self._schedule_idle_check(threshold_seconds - idle_seconds)
+                return
+        self.clear_models()
+
+    def _schedule_idle_check(self, delay_seconds):
+        """Start the background idle-check timer unless one is already pending; caller holds _idle_lock."""
+        if self._idle_timer is None:
+            self._idle_timer = threading.Timer(delay_seconds, self.clear_if_idle)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
 def get_config(key, default=None):
     """Helper function to safely get config values"""
     try:
@@ -113,7 +149,8 @@ def standardize_aylien_articles(articles):
                 'content': article['content'],
                 'source': article['source']['name'] if isinstance(article['source'], dict) and 'name' in article['source'] else 'Aylien'
             }
-            logger.debug(f"Standardized Aylien article {i+1}: {standardized_article['title']} (Source: {standardized_article['source']})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Standardized Aylien article %d: %s (Source: %s)", i + 1, standardized_article['title'], standardized_article['source'])
             standardized_articles.append(standardized_article)
         except Exception as e:
             logger.error(f"Error standardizing Aylien article {i+1}: {e}")
@@ -133,7 +170,8 @@ def standardize_gnews_articles(articles):
                 'content': article.get('content', ''),
                 'source': article.get('source', {}).get('name', 'GNews')
             }
-            logger.debug(f"Standardized GNews article {i+1}: {standardized_article['title']} (Source: {standardized_article['source']})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Standardized GNews article %d: %s (Source: %s)", i + 1, standardized_article['title'], standardized_article['source'])
             standardized_articles.append(standardized_article)
         except Exception as e:
             logger.error(f"Error standardizing GNews article {i+1}: {e}")
@@ -178,7 +216,8 @@ def standardize_nyt_articles(articles):
                 'content': content,
                 'source': 'New York Times'
             }
-            logger.debug(f"NYT: Successfully standardized article {i+1}: {standardized_article['title']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("NYT: Successfully standardized article %d: %s", i + 1, standardized_article['title'])
             standardized_articles.append(standardized_article)
         except Exception as e:
             logger.error(f"NYT: Error standardizing article {i+1}: {e}")
@@ -205,7 +244,8 @@ def standardize_mediastack_articles(articles):
                 'content': content,
                 'source': article.get('source', 'Mediastack')
             }
-            logger.debug(f"Mediastack: Successfully standardized article {i+1}: {standardized_article['title']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Mediastack: Successfully standardized article %d: %s", i + 1, standardized_article['title'])
             standardized_articles.append(standardized_article)
         except Exception as e:
             logger.error(f"Mediastack: Error standardizing article {i+1}: {e}")
@@ -232,7 +272,8 @@ def standardize_newsapi_ai_articles(articles):
                 'content': content,
                 'source': article.get('source', {}).get('title', 'NewsAPI.ai')
             }
-            logger.debug(f"NewsAPI.ai: Successfully standardized article {i+1}: {standardized_article['title']}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("NewsAPI.ai: Successfully standardized article %d: %s", i + 1, standardized_article['title'])
             standardized_articles.append(standardized_article)
         except Exception as e:
             logger.error(f"NewsAPI.ai: Error standardizing article {i+1}: {e}")
@@ -271,16 +312,44 @@ def analyze_sentiment(text):
         logger.error(f"Error in sentiment analysis: {e}")
         return 0
 
+def analyze_sentiment_batch(texts):
+    """Analyze the sentiment of several texts in one model call; returns normalized scores between -1 and 1.
+    Unlike analyze_sentiment, model errors are raised rather than scored as 0."""
+    if not texts:
+        return []
+    model_manager = ModelManager.get_instance()
+    sentiment_analyzer = model_manager.get_sentiment_analyzer()
+    texts = [text[:512] for text in texts]
+    try:
+        results = sentiment_analyzer(texts, batch_size=len(texts))
+    except TypeError:
+        # Analyzers that don't take batch_size (e.g. mock models) are called one text at a time
+        results = [sentiment_analyzer(text)[0] for text in texts]
+    return [result['score'] if result['label'] == 'POSITIVE' else -result['score'] for result in results]
+
+def get_shingle_hashes(text, size=None):
+    """Hash the overlapping word n-grams (shingles) of a text; texts shorter than one shingle yield none."""
+    size = size or SHINGLE_SIZE
+    tokens = re.findall(r'\w+', text.lower())
+    return {hash(tuple(tokens[i:i + size])) for i in range(len(tokens) - size + 1)}
+
 def remove_duplicates(articles):
-    """Remove duplicate articles based on their titles."""
+    """Remove duplicate articles: exact title matches and near-duplicates whose content
+    shingles are mostly already covered by an earlier article."""
     logger.info(f"Removing duplicates from {len(articles)} articles")
     seen_titles = set()
+    seen_shingles = set()
     unique_articles = []
     for article in articles:
         title = article.get('title', '')
-        if title and title not in seen_titles:
-            seen_titles.add(title)
-            unique_articles.append(article)
+        if not title or title in seen_titles:
+            continue
+        shingles = get_shingle_hashes(article.get('content') or '')
+        if shingles and len(shingles & seen_shingles) >= DUPLICATE_SHINGLE_RATIO * len(shingles):
+            continue
+        seen_titles.add(title)
+        seen_shingles |= shingles
+        unique_articles.append(article)
     logger.info(f"Removed {len(articles) - len(unique_articles)} duplicates")
     return unique_articles
 
@@ -349,7 +418,7 @@ def summarize_articles(articles, query):
             summary = response.choices[0].message.content
         except Exception as e:
             logger.error(f"OpenAI API call failed: {str(e)}", exc_info=True)
-            summary = f"Error generating summary: {str(e)}"
+            summary = f"{SUMMARY_ERROR_PREFIX}: {str(e)}"
     else:
         # BART summarization
         combined_content = " ".join([article.get('content', '') or article.get('title', '') for article in articles])
@@ -362,11 +431,10 @@ def summarize_articles(articles, query):
                 sentences = re.split(r'(?<=[.!?])\s+', summary_text.strip())
                 formatted_summary = '<br>'.join(sentences)
                 logger.info("Summary generated successfully with sentence splitting")
-                model_manager.clear_models()
                 summary = formatted_summary
             except Exception as e:
                 logger.error(f"Error generating summary: {e}")
-                summary = "Error generating summary."
+                summary = f"{SUMMARY_ERROR_PREFIX}."
         else:
             logger.warning("No content available for summarization")
             summary = "No content available for summarization."
@@ -394,9 +462,9 @@ def process_trending_articles(trending_data):
         
         standardized_articles = process_articles(articles, source='Unknown')  # Adjust source as needed
         
-        # Note: process_trending_articles seems to reference undefined functions; fixing here
-        for article in standardized_articles:
-            article['sentiment_score'] = analyze_sentiment(article['content'])
+        scores = analyze_sentiment_batch([article['content'] for article in standardized_articles])
+        for article, score in zip(standardized_articles, scores):
+            article['sentiment_score'] = score
         
         summary = summarize_articles(standardized_articles, topic)
         
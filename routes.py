@@ -3,53 +3,31 @@ This file defines the web routes for the Neutral News application.
 It handles HTTP requests for the main page, news fetching, and API endpoints.
 """
 
-from flask import Blueprint, render_template, request, jsonify
-from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, Response, render_template, request, jsonify, stream_with_context
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import hashlib
 import logging
+import re
 import time
-<<<<<<< HEAD
 import inspect
+import orjson
+import numpy as np
 from fetchers import (fetch_newsapi_org, fetch_guardian, fetch_aylien_articles,
                      fetch_gnews_articles, fetch_nyt_articles, fetch_mediastack_articles,
                      fetch_newsapi_ai_articles)
 from processors import (process_articles, remove_duplicates, filter_relevant_articles,
-                       summarize_articles, ModelManager)
+                       summarize_articles, analyze_sentiment_batch, get_config, SUMMARY_ERROR_PREFIX)
 from trends import get_trending_topics
-=======
-from fetchers import (
-    fetch_newsapi_org,
-    fetch_guardian,
-    fetch_aylien_articles,
-    fetch_gnews_articles,
-    fetch_nyt_articles,
-    fetch_mediastack_articles,
-    fetch_newsapi_ai_articles
-)
-from processors import (
-    process_articles,
-    remove_duplicates,
-    filter_relevant_articles,
-    summarize_articles,
-    ModelManager
-)
-from config_prod import MAX_ARTICLES_PER_SOURCE, cache
-from .trends import get_trending_topics
-from .fetchers import fetch_trending_articles
-from .processors import process_trending_articles
->>>>>>> dbcc478 (added logging)
+from config import cache
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-<<<<<<< HEAD
 # Log when this module is imported
 logger.info(f"[IMPORT_SEQUENCE] {time.time()} - Routes module is being imported")
-=======
-logger.info("Initializing routes Blueprint")
-routes = Blueprint('news_routes', __name__, template_folder='templates')  # Match app.py's unique name
-logger.info("Routes Blueprint initialized with routes to be registered")
->>>>>>> dbcc478 (added logging)
 
 # Log the call stack to see who's importing this module
 current_frame = inspect.currentframe()
@@ -66,91 +44,187 @@ finally:
 routes = Blueprint('routes', __name__)
 logger.info(f"[BLUEPRINT] {time.time()} - Routes blueprint created")
 
+# Long-lived pool for the per-API fetches so threads are not spawned and joined on every request.
+# Sized for two overlapping requests of seven fetches each.
+fetch_executor = ThreadPoolExecutor(max_workers=14, thread_name_prefix='fetch')
+
+# News APIs queried for every event, as (source name, fetcher); the name is passed to process_articles
+NEWS_SOURCES = (
+    ("NewsAPI", fetch_newsapi_org),
+    ("Guardian", fetch_guardian),
+    ("Aylien", fetch_aylien_articles),
+    ("GNews", fetch_gnews_articles),
+    ("NYT", fetch_nyt_articles),
+    ("Mediastack", fetch_mediastack_articles),
+    ("NewsAPI.ai", fetch_newsapi_ai_articles),
+)
+
+# Per-article sentiment scores are cached for a day, since the same article turns up under many events
+SENTIMENT_CACHE_TIMEOUT = 86400
+
+# Article content is cut to this length in /data responses; the UI only shows a preview
+MAX_CONTENT_CHARS = 500
+
+def ojsonify(data, status=200):
+    """Serialize data with orjson, which is faster than jsonify, emits UTF-8 bytes directly
+    and encodes NumPy scalars and arrays natively."""
+    return Response(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype='application/json')
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage with the monotonic clock and log its duration once on exit."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        logger.info("[FETCH_PROCESS] %s took %.2fs", name, (time.perf_counter_ns() - start) / 1e9)
+
+def fetch_and_standardize(fetcher, event, source):
+    """Fetch articles for an event and standardize them on the same worker thread."""
+    return process_articles(fetcher(event), source)
+
+def normalize_event(event):
+    """Canonicalize an event query so equivalent searches share one cache entry."""
+    return re.sub(r'\s+', ' ', event.strip().lower())
+
+def sentiment_cache_key(article):
+    """Cache key for an article's sentiment score; URL and title together identify the article across events."""
+    digest = hashlib.sha1(f"{article['url']}\n{article['title']}".encode('utf-8')).hexdigest()
+    return f"sentiment:{digest}"
+
+def is_cacheable_result(result):
+    """Only cache pipeline results that completed without an error message or a failed summary."""
+    summary, _, error = result
+    return error is None and not summary.startswith(SUMMARY_ERROR_PREFIX)
+
+@cache.memoize(timeout=3600, response_filter=is_cacheable_result)
 def fetch_and_process_data(event):
+    """Cached entry point for the news pipeline, keyed on the event."""
+    return _fetch_and_process_data(event)
+
+def _fetch_and_process_data(event):
     """Main function to fetch and process news data"""
-    start_time = time.time()
-    logger.info(f"[FETCH_PROCESS] Starting fetch_and_process_data for event '{event}'")
-    
+    logger.info("[FETCH_PROCESS] Starting fetch_and_process_data for event '%s'", event)
+
     try:
-        # Fetch articles from multiple APIs in parallel
-        with ThreadPoolExecutor(max_workers=7) as executor:
-            futures = [
-                executor.submit(fetch_newsapi_org, event),
-                executor.submit(fetch_guardian, event),
-                executor.submit(fetch_aylien_articles, event),
-                executor.submit(fetch_gnews_articles, event),
-                executor.submit(fetch_nyt_articles, event),
-                executor.submit(fetch_mediastack_articles, event),
-                executor.submit(fetch_newsapi_ai_articles, event)
-            ]
-            results = [future.result() for future in futures]
-            logger.info(f"[FETCH_PROCESS] Fetched articles from all APIs in {time.time() - start_time:.2f}s")
-        
-        newsapi_org_articles, guardian_articles, aylien_articles, gnews_articles, nyt_articles, mediastack_articles, newsapi_ai_articles = results
-        
-        # Process and standardize articles
-        all_articles = (
-            process_articles(newsapi_org_articles, "NewsAPI") +
-            process_articles(guardian_articles, "Guardian") +
-            process_articles(aylien_articles, "Aylien") +
-            process_articles(gnews_articles, "GNews") +
-            process_articles(nyt_articles, "NYT") +
-            process_articles(mediastack_articles, "Mediastack") +
-            process_articles(newsapi_ai_articles, "NewsAPI.ai")
-        )
-        logger.info(f"[FETCH_PROCESS] Standardized {len(all_articles)} articles in {time.time() - start_time:.2f}s")
-        
-        if not all_articles:
-            logger.warning(f"[FETCH_PROCESS] No articles found for '{event}'")
-            return None, None, f"No articles found for '{event}'"
-            
-        # Process sentiment
-        if all_articles:  # Safety check before processing
-            model_manager = ModelManager.get_instance()
-            sentiment_analyzer = model_manager.get_sentiment_analyzer()
-            titles = [article['title'][:200] for article in all_articles]
-            contents = [article['content'][:200] for article in all_articles]
-            
-            logger.info(f"[FETCH_PROCESS] Starting sentiment analysis for {len(all_articles)} articles")
-            sentiment_start = time.time()
-            title_results = sentiment_analyzer(titles)
-            content_results = sentiment_analyzer(contents)
-            logger.info(f"[FETCH_PROCESS] Completed sentiment analysis in {time.time() - sentiment_start:.2f}s")
-            
-            for article, title_result, content_result in zip(all_articles, title_results, content_results):
-                title_score = title_result['score'] if title_result['label'] == 'POSITIVE' else -title_result['score']
-                content_score = content_result['score'] if content_result['label'] == 'POSITIVE' else -content_result['score']
-                article['sentiment_score'] = 0.3 * title_score + 0.7 * content_score
-        
-        # Remove duplicates and filter relevant articles
-        unique_articles = remove_duplicates(all_articles)
-        relevant_articles = filter_relevant_articles(unique_articles, event)
-        logger.info(f"[FETCH_PROCESS] Filtered to {len(relevant_articles)} relevant articles in {time.time() - start_time:.2f}s")
-        
-        if not relevant_articles:
-            logger.warning(f"[FETCH_PROCESS] No relevant articles found for '{event}'")
-            return None, None, f"No relevant articles found for '{event}'"
-            
-        # Generate summary
-        summary_start = time.time()
-        summary = summarize_articles(relevant_articles, event)
-        logger.info(f"[FETCH_PROCESS] Generated summary in {time.time() - summary_start:.2f}s")
-        
-        total_time = time.time() - start_time
-        logger.info(f"[FETCH_PROCESS] Completed fetch_and_process_data for '{event}' in {total_time:.2f}s")
+        with stage("fetch_and_process_data"):
+            relevant_articles, error_message = fetch_relevant_articles(event)
+            if error_message:
+                return None, None, error_message
+
+            # Generate summary
+            with stage("summarize"):
+                summary = summarize_articles(relevant_articles, event)
+
         return summary, relevant_articles, None
-        
+
     except Exception as e:
-        logger.error(f"[FETCH_PROCESS] Error in fetch_and_process_data: {str(e)}", exc_info=True)
+        logger.error("[FETCH_PROCESS] Error in fetch_and_process_data: %s", e, exc_info=True)
         return None, None, f"Error processing request: {str(e)}"
 
+def fetch_relevant_articles(event):
+    """Fetch, score, deduplicate and filter the articles for an event, stopping short of summarization.
+    Returns (relevant_articles, error_message)."""
+    # Fetch and standardize articles from multiple APIs in parallel
+    all_articles = []
+    failed_sources = []
+    with stage("fetch"):
+        futures = {fetch_executor.submit(fetch_and_standardize, fetcher, event, source): source
+                   for source, fetcher in NEWS_SOURCES}
+        for future in as_completed(futures):
+            articles = future.result()
+            if not articles:
+                failed_sources.append(futures[future])
+            all_articles.extend(articles)
+    logger.info("[FETCH_PROCESS] Fetched and standardized %d articles", len(all_articles))
+    if failed_sources:
+        logger.info("[FETCH_PROCESS] No articles from: %s", ", ".join(failed_sources))
+
+    # Cap the number of articles per source and collect the sentiment inputs in a single pass
+    max_per_source = get_config('MAX_ARTICLES_PER_SOURCE', 10)
+    source_counts = defaultdict(int)
+    capped_articles = []
+    titles = []
+    contents = []
+    for article in all_articles:
+        # Sources are names from here on, so they can be counted and returned as they are
+        source = article['source']
+        if isinstance(source, dict):
+            source = article['source'] = source.get('name', 'Unknown')
+        if source_counts[source] < max_per_source:
+            capped_articles.append(article)
+            titles.append(article['title'][:200])
+            contents.append(article['content'][:200])
+            source_counts[source] += 1
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[FETCH_PROCESS] Dropping article from '%s' over the per-source cap", source)
+    all_articles = capped_articles
+
+    if not all_articles:
+        logger.warning("[FETCH_PROCESS] No articles found for '%s'", event)
+        return None, f"No articles found for '{event}'"
+
+    # Process sentiment, reusing the scores of articles already seen under another event
+    with stage("sentiment"):
+        score_keys = [sentiment_cache_key(article) for article in all_articles]
+        scores = cache.get_many(*score_keys)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            # Titles and contents go through the model as one batch
+            batch_scores = analyze_sentiment_batch([titles[i] for i in missing] + [contents[i] for i in missing])
+
+            new_scores = {}
+            for i, title_score, content_score in zip(missing, batch_scores[:len(missing)], batch_scores[len(missing):]):
+                scores[i] = new_scores[score_keys[i]] = 0.3 * title_score + 0.7 * content_score
+            cache.set_many(new_scores, timeout=SENTIMENT_CACHE_TIMEOUT)
+        logger.info("[FETCH_PROCESS] Scored %d articles, %d from cache", len(scores), len(scores) - len(missing))
+
+        for article, score in zip(all_articles, scores):
+            article['sentiment_score'] = score
+
+    # Remove duplicates and filter relevant articles
+    with stage("filter"):
+        unique_articles = remove_duplicates(all_articles)
+        relevant_articles = filter_relevant_articles(unique_articles, event)
+    logger.info("[FETCH_PROCESS] Filtered to %d relevant articles", len(relevant_articles))
+
+    if not relevant_articles:
+        logger.warning("[FETCH_PROCESS] No relevant articles found for '%s'", event)
+        return None, f"No relevant articles found for '{event}'"
+
+    return relevant_articles, None
+
+def build_article_data(articles):
+    """Build the response articles and their metadata in a single pass over the final article set."""
+    source_counts = Counter()
+    article_data = []
+    for article in articles:
+        # title, url, content and source are always set by process_articles; source is a name string
+        source = article['source']
+        source_counts[source] += 1
+        article_data.append({
+            'title': article['title'],
+            'url': article['url'],
+            'content': article['content'][:MAX_CONTENT_CHARS],
+            'source': source,
+            'sentiment_score': article.get('sentiment_score', 0.0)
+        })
+    # Average the scores with a NumPy reduction rather than a Python-level running sum
+    scores = np.fromiter((item['sentiment_score'] for item in article_data), dtype=np.float64, count=len(article_data))
+    metadata = {
+        'total_articles': len(article_data),
+        'average_sentiment': float(scores.mean()) if scores.size else 0,
+        'source_distribution': dict(source_counts)
+    }
+    return article_data, metadata
+
 def get_trending_summaries():
     """Fetch and process summaries for trending topics"""
     start_time = time.time()
     topics = get_trending_topics(limit=4)
     summaries = {}
     logger.info(f"[TRENDING] Fetching trending summaries for topics: {topics}")
-    
+
     # with ThreadPoolExecutor(max_workers=4) as executor:
     #     future_to_topic = {executor.submit(fetch_and_process_data, topic): topic for topic in topics}
     #     for future in future_to_topic:
@@ -173,62 +247,12 @@ def get_trending_summaries():
     #                 'summary': "Error generating summary",
     #                 'articles': []
     #             }
-    
+
     logger.info(f"[TRENDING] Generated trending summaries for {list(summaries.keys())} in {time.time() - start_time:.2f}s")
     return summaries
 
 @routes.route('/', methods=['GET', 'POST'])
 def index():
-<<<<<<< HEAD
-    """Main route that displays trending topics and handles search"""
-    try:
-        # Get trending summaries
-        trending_start = time.time()
-        trending_summaries = get_trending_summaries()
-        logger.info(f"[ROUTE] Loaded trending summaries in {time.time() - trending_start:.2f}s")
-        
-        # Handle POST request (search form submission)
-        if request.method == 'POST':
-            event = request.form.get('event')
-            if event:
-                logger.info(f"[ROUTE] Processing search for event '{event}'")
-                summary, articles, error = fetch_and_process_data(event)
-                return render_template('index.html', 
-                                    summary=summary,
-                                    articles=articles,
-                                    event=event,
-                                    error=error,
-                                    trending_summaries=trending_summaries)
-        
-        # Handle GET request (initial page load)
-        logger.info("[ROUTE] Rendering index page with trending summaries")
-        return render_template('index.html',
-                            summary=None,
-                            articles=[],
-                            event=None,
-                            error=None,
-                            trending_summaries=trending_summaries)
-    except Exception as e:
-        logger.error(f"[ROUTE] Error in index route: {str(e)}", exc_info=True)
-        return render_template('index.html',
-                            summary=None,
-                            articles=[],
-                            event=None,
-                            error=str(e),
-                            trending_summaries={})
-
-@routes.route('/api/news', methods=['GET', 'POST'])
-def get_news():
-    """
-    API endpoint for fetching news data
-    Supports both GET (query params) and POST (form data)
-    """
-    # Get query from either POST form data or GET query params
-    event = request.form.get('event') if request.method == 'POST' else request.args.get('q')
-    if not event:
-        logger.warning("[API] No query provided in request")
-        return jsonify({"error": "No query provided"}), 400
-=======
     """Handle the main route for displaying trending topics and fetching custom summaries."""
     logger.info("[INDEX] Route / accessed")
     logger.info(f"[INDEX] Request method: {request.method}")
@@ -237,7 +261,7 @@ def get_news():
     articles = []
     event = None
     error = None
-    trending_summaries = get_trending_summaries()  # Fetch from cache
+    trending_summaries = get_trending_summaries()
 
     if request.method == 'POST':
         event = request.form.get('event')
@@ -247,13 +271,7 @@ def get_news():
             logger.warning("[INDEX] No event provided in POST request")
         else:
             logger.info(f"[INDEX] Calling fetch_and_process_data for event: {event}")
-            result = fetch_and_process_data(event)
-            if isinstance(result, tuple):
-                summary, articles, error = result
-            else:
-                summary = result.get('summary')
-                articles = result.get('articles', [])
-                error = None
+            summary, articles, error = fetch_and_process_data(normalize_event(event))
             logger.info(f"[INDEX] After fetch_and_process_data, summary: {summary is not None}, articles: {len(articles) if articles else 0}, error: {error}")
             if error:
                 logger.error(f"[INDEX] Error in processing event '{event}': {error}")
@@ -261,25 +279,25 @@ def get_news():
     logger.info(f"[INDEX] Rendering template with summary: {summary is not None}, articles: {len(articles) if articles else 0}, event: {event}, error: {error}")
     return render_template('index.html', summary=summary, articles=articles, event=event, error=error, trending_summaries=trending_summaries)
 
-@routes.route('/data', methods=['POST'])
-def get_news_data():
-    """Handle the AJAX request for fetching news data with detailed error logging."""
-    logger.info("[DATA] Route /data accessed")
-    logger.info(f"[DATA] Received POST request with data: {request.get_json(silent=True)}")
-    logger.info(f"[DATA] Request headers: {dict(request.headers)}")
-    logger.info(f"[DATA] Request form data: {request.form}")
-    logger.info(f"[DATA] Request args: {request.args}")
-    logger.info(f"[DATA] Raw request data: {request.data}")
->>>>>>> dbcc478 (added logging)
+@routes.route('/api/news', methods=['GET', 'POST'])
+def get_news():
+    """
+    API endpoint for fetching news data
+    Supports both GET (query params) and POST (form data)
+    """
+    # Get query from either POST form data or GET query params
+    event = request.form.get('event') if request.method == 'POST' else request.args.get('q')
+    if not event:
+        logger.warning("[API] No query provided in request")
+        return ojsonify({"error": "No query provided"}, 400)
 
     try:
         logger.info(f"[API] Processing news request for event '{event}'")
-        summary, articles, error_message = fetch_and_process_data(event)
+        summary, articles, error_message = fetch_and_process_data(normalize_event(event))
         if error_message and not articles:
             logger.warning(f"[API] No articles found for '{event}': {error_message}")
-            return jsonify({"error": error_message}), 404
-        
-<<<<<<< HEAD
+            return ojsonify({"error": error_message}, 404)
+
         response_data = {
             "status": "success",
             "summary": summary,
@@ -287,90 +305,112 @@ def get_news_data():
             "error": error_message if error_message else None
         }
         logger.info(f"[API] Successfully processed request for '{event}'")
-        return jsonify(response_data)
+        return ojsonify(response_data)
     except Exception as e:
         logger.error(f"[API] Error processing request for event '{event}': {str(e)}", exc_info=True)
-        return jsonify({"error": "Internal server error"}), 500
+        return ojsonify({"error": "Internal server error"}, 500)
 
-@routes.route('/health')
-def health_check():
-    logger.info("[HEALTH] Health check requested")
-    return jsonify({"status": "healthy", "message": "API is operational"})
-=======
+@routes.route('/data', methods=['POST'])
+def get_news_data():
+    """Handle the AJAX request for fetching news data with detailed error logging."""
+    logger.info("[DATA] Route /data accessed")
+    logger.info(f"[DATA] Received POST request with data: {request.get_json(silent=True)}")
+    logger.info(f"[DATA] Request headers: {dict(request.headers)}")
+    logger.info(f"[DATA] Request form data: {request.form}")
+    logger.info(f"[DATA] Request args: {request.args}")
+    logger.info(f"[DATA] Raw request data: {request.data}")
+
+    try:
+        event = (request.get_json(silent=True) or {}).get('event') or request.form.get('event')
         if not event:
             logger.error("[DATA] No event provided in request")
-            return jsonify({'error': "Please enter a news event to search for."}), 400
-        
+            return ojsonify({'error': "Please enter a news event to search for."}, 400)
+
         logger.info(f"[DATA] Processing event: {event}")
-        result = fetch_and_process_data(event)
-        
-        # Log detailed result info
-        if isinstance(result, tuple):
-            summary, articles, error = result
-            logger.info(f"[DATA] fetch_and_process_data returned tuple - summary: {summary is not None}, "
-                        f"articles: {len(articles) if articles else 0}, error: {error}")
-            # Create metadata if it's not available
-            if articles:
-                total_sentiment = sum(article.get('sentiment_score', 0) for article in articles)
-                avg_sentiment = total_sentiment / len(articles) if articles else 0
-                source_counts = {}
-                for article in articles:
-                    source = article.get('source', 'Unknown')
-                    source_counts[source] = source_counts.get(source, 0) + 1
-                metadata = {
-                    'total_articles': len(articles),
-                    'average_sentiment': avg_sentiment,
-                    'source_distribution': source_counts
-                }
-            else:
-                metadata = {
-                    'total_articles': 0,
-                    'average_sentiment': 0,
-                    'source_distribution': {}
-                }
-        else:
-            summary = result.get('summary')
-            articles = result.get('articles', [])
-            metadata = result.get('metadata', {
-                'total_articles': len(articles),
-                'average_sentiment': 0,
-                'source_distribution': {}
-            })
-            error = None
-            logger.info(f"[DATA] fetch_and_process_data returned dict - summary: {summary is not None}, "
-                        f"articles: {len(articles)}, metadata: {metadata}, error: {error}")
+        summary, articles, error = fetch_and_process_data(normalize_event(event))
+        logger.info(f"[DATA] fetch_and_process_data returned - summary: {summary is not None}, "
+                    f"articles: {len(articles) if articles else 0}, error: {error}")
 
         # Prepare and log the response
         if articles:
+            article_data, metadata = build_article_data(articles)
             response_data = {
                 'summary': summary if summary else "Summary not available.",
-                'articles': articles,
+                'articles': article_data,
                 'metadata': metadata
             }
             if error:  # Add warning if there was a partial failure
                 response_data['warning'] = error
                 logger.warning(f"[DATA] Partial failure warning: {error}")
-            logger.info(f"[DATA] Returning success response - articles: {len(articles)}, summary: {summary is not None}")
+            logger.info(f"[DATA] Returning success response - articles: {len(article_data)}, summary: {summary is not None}")
             logger.info(f"[DATA] Response data: {response_data}")
-            return jsonify(response_data), 200
+            return ojsonify(response_data, 200)
         elif error:
             logger.error(f"[DATA] Returning error response: {error}")
             logger.info(f"[DATA] Response data: {{'error': '{error}'}}")
-            return jsonify({'error': error}), 400
+            return ojsonify({'error': error}, 400)
         else:
             logger.error("[DATA] No articles found and no specific error provided")
             logger.info("[DATA] Response data: {'error': 'No articles found.'}")
-            return jsonify({'error': 'No articles found.'}), 404
+            return ojsonify({'error': 'No articles found.'}, 404)
 
     except Exception as e:
         logger.error(f"[DATA] Unexpected error in get_news_data: {str(e)}", exc_info=True)
         logger.info(f"[DATA] Response data: {{'error': 'An internal server error occurred: {str(e)}'}}")
-        return jsonify({'error': f"An internal server error occurred: {str(e)}"}), 500
+        return ojsonify({'error': f"An internal server error occurred: {str(e)}"}, 500)
+
+@routes.route('/data/stream', methods=['POST'])
+def stream_news_data():
+    """Stream the results for an event as NDJSON: the articles as soon as filtering completes,
+    then the summary once summarization finishes."""
+    event = (request.get_json(silent=True) or {}).get('event') or request.form.get('event')
+    if not event:
+        logger.error("[STREAM] No event provided in request")
+        return ojsonify({'error': "Please enter a news event to search for."}, 400)
+    event = normalize_event(event)
+
+    def generate():
+        # Serve straight from the pipeline cache when this event has already been processed
+        cache_key = fetch_and_process_data.make_cache_key(fetch_and_process_data.uncached, event)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            summary, articles, _ = cached
+            article_data, metadata = build_article_data(articles)
+            yield orjson.dumps({'stage': 'articles', 'data': article_data, 'metadata': metadata},
+                               option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+            yield orjson.dumps({'stage': 'summary', 'data': summary}, option=orjson.OPT_APPEND_NEWLINE)
+            return
+
+        try:
+            articles, error = fetch_relevant_articles(event)
+            if error:
+                yield orjson.dumps({'stage': 'error', 'error': error}, option=orjson.OPT_APPEND_NEWLINE)
+                return
+            article_data, metadata = build_article_data(articles)
+            yield orjson.dumps({'stage': 'articles', 'data': article_data, 'metadata': metadata},
+                               option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+
+            with stage("summarize"):
+                summary = summarize_articles(articles, event)
+            result = (summary, articles, None)
+            if is_cacheable_result(result):
+                cache.set(cache_key, result, timeout=fetch_and_process_data.cache_timeout)
+            yield orjson.dumps({'stage': 'summary', 'data': summary}, option=orjson.OPT_APPEND_NEWLINE)
+        except Exception as e:
+            logger.error("[STREAM] Error streaming results for '%s': %s", event, e, exc_info=True)
+            yield orjson.dumps({'stage': 'error', 'error': f"Error processing request: {str(e)}"},
+                               option=orjson.OPT_APPEND_NEWLINE)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@routes.route('/health')
+def health_check():
+    logger.info("[HEALTH] Health check requested")
+    return jsonify({"status": "healthy", "message": "API is operational"})
 
 @routes.route('/test', methods=['GET'])
 def test():
     """Test route to verify routing is working."""
     logger.info("[TEST] Test route accessed")
     logger.info("[TEST] Returning status: ok")
-    return jsonify({"status": "ok"})
->>>>>>> dbcc478 (added logging)
+    return ojsonify({"status": "ok"})
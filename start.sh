@@ -14,6 +14,7 @@ fi
 
 # Start the application with Gunicorn
 # Bind to 0.0.0.0 with the PORT from environment
-# Use 4 worker processes
-echo "Starting Gunicorn on 0.0.0.0:$PORT"
-exec gunicorn app:app --bind 0.0.0.0:$PORT --workers=4 --access-logfile=- --error-logfile=-
\ No newline at end of file
+# Worker processes come from WEB_CONCURRENCY (default 4) so they can be sized to the instance's CPUs
+WEB_CONCURRENCY=${WEB_CONCURRENCY:-4}
+echo "Starting Gunicorn on 0.0.0.0:$PORT with $WEB_CONCURRENCY workers"
+exec gunicorn app:app --bind 0.0.0.0:$PORT --workers=$WEB_CONCURRENCY --access-logfile=- --error-logfile=-
\ No newline at end of file
@@ -1,15 +1,35 @@
+import copy
 import pytest
 import time
-from unittest.mock import patch, MagicMock
-from app.utils.api_manager import APIManager, APIQuota
+from api_clients.utils import api_manager as api_manager_module
+from api_clients.utils.api_manager import APIManager, APIQuota
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def api_manager():
-    manager = APIManager()
+    """The APIManager singleton, built once for the module"""
+    return APIManager()
+
+@pytest.fixture(autouse=True)
+def _reset(api_manager):
+    """Give every test the same keys and quotas, restoring the singleton's state afterwards"""
+    quotas = copy.deepcopy(api_manager.quotas)
+    api_manager.api_keys.clear()
+    api_manager.last_key_rotation.clear()
     # Register some test API keys
-    manager.register_api_key('newsapi', 'test_key_1', 'test_value_1')
-    manager.register_api_key('newsapi', 'test_key_2', 'test_value_2')
-    return manager
+    api_manager.register_api_key('newsapi', 'test_key_1', 'test_value_1')
+    api_manager.register_api_key('newsapi', 'test_key_2', 'test_value_2')
+    yield
+    api_manager.api_keys.clear()
+    api_manager.last_key_rotation.clear()
+    api_manager.quotas.clear()
+    api_manager.quotas.update(quotas)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock for the APIManager that tests advance instantly instead of sleeping"""
+    now = [time.time()]
+    monkeypatch.setattr(api_manager_module.time, 'time', lambda: now[0])
+    return now
 
 def test_singleton_pattern():
     """Test that APIManager is a singleton"""
@@ -23,21 +43,21 @@ def test_api_key_registration(api_manager):
     assert 'test_api' in api_manager.api_keys
     assert api_manager.api_keys['test_api']['key1'] == 'value1'
 
-def test_api_key_rotation(api_manager):
+def test_api_key_rotation(api_manager, clock):
     """Test API key rotation"""
     # Get initial key
     initial_key = api_manager.get_api_key('newsapi')
     assert initial_key is not None
     
-    # Force key rotation by setting last rotation time to past
-    api_manager.last_key_rotation['newsapi'] = time.time() - 3601
+    # Force key rotation by moving the clock past the rotation interval
+    clock[0] += 3601
     
     # Get key again, should be different
     rotated_key = api_manager.get_api_key('newsapi')
     assert rotated_key is not None
     assert rotated_key != initial_key
 
-def test_rate_limiting(api_manager):
+def test_rate_limiting(api_manager, clock):
     """Test rate limiting functionality"""
     api_name = 'test_api'
     api_manager.quotas[api_name] = APIQuota(
@@ -52,8 +72,8 @@ def test_rate_limiting(api_manager):
     # Second request in same second should be denied
     assert api_manager.can_make_request(api_name) is False
     
-    # Wait for 1 second and try again
-    time.sleep(1.1)
+    # Move the clock past the one-second window and try again
+    clock[0] += 1.1
     assert api_manager.can_make_request(api_name) is True
 
 def test_handle_rate_limit_error(api_manager):
@@ -1,40 +1,43 @@
 import unittest
 import pytest
-import json
-import os
-import sys
-from unittest.mock import patch, MagicMock
-
-# Add the parent directory to sys.path to import application modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unittest.mock import MagicMock
 
 # Import mock modules for testing
-from mock_services import patch_modules, mock_fetch_newsapi
-from mock_data import MOCK_ARTICLES, get_mock_articles
-
-# Patch modules before importing app
-patch_modules()
+pytest.importorskip("mock_data")
+from mock_data import MOCK_ARTICLES
 
-# Import application modules after patching
-import app_test
-from app_test import app
+# Source normalizers keyed by the exact type of the source; strings and other types pass through unchanged
+_SOURCE_NORMALIZERS = {
+    dict: lambda source, default: source['name'] if 'name' in source else source,
+    type(None): lambda source, default: default,
+}
 
 # Patch the source extraction in routes.py
 def patched_get_source(article, default='Unknown'):
     """Patched function to extract source name from article"""
     source = article.get('source', default)
-    if isinstance(source, dict) and 'name' in source:
-        return source['name']
-    return source
+    normalize = _SOURCE_NORMALIZERS.get(type(source))
+    return normalize(source, default) if normalize else source
+
+original_fetch_and_process = None
 
-# Apply the patch
-import routes
-routes.article_get_source = patched_get_source
+def setup_module(module):
+    """Patch routes.py to use our patched functions; routes is imported here, when the tests run"""
+    global original_fetch_and_process
+    import routes
+    routes.article_get_source = patched_get_source
+    original_fetch_and_process = routes._fetch_and_process_data
+    routes._fetch_and_process_data = patched_fetch_and_process_data
+
+def teardown_module(module):
+    """Restore the original _fetch_and_process_data"""
+    import routes
+    if original_fetch_and_process:
+        routes._fetch_and_process_data = original_fetch_and_process
 
-# Monkey patch the routes.py file to use our patched function
-original_fetch_and_process = routes._fetch_and_process_data
 def patched_fetch_and_process_data(event):
     """Patched version of _fetch_and_process_data that handles source dictionaries"""
+    import routes
     try:
         # Call the original function
         result = original_fetch_and_process(event)
@@ -43,44 +46,35 @@ def patched_fetch_and_process_data(event):
         if "unhashable type: 'dict'" in str(e):
             # Fix the source in all_articles
             for article in routes.all_articles:
-                source = article.get('source', 'Unknown')
-                if isinstance(source, dict) and 'name' in source:
-                    article['source'] = source['name']
+                article['source'] = patched_get_source(article)
             # Try again
             return original_fetch_and_process(event)
         else:
             # Re-raise other TypeErrors
             raise
 
-# Apply the patch
-routes._fetch_and_process_data = patched_fetch_and_process_data
-
+@pytest.mark.usefixtures("class_client")
 class TestNeutralNewsApp(unittest.TestCase):
-    def setUp(self):
-        # Set up Flask test client
-        app.config['TESTING'] = True
-        self.client = app.test_client()
-    
-    def tearDown(self):
-        # Clean up any resources if needed
-        pass
-    
+    @pytest.fixture(autouse=True)
+    def _monkeypatch(self, monkeypatch):
+        # Give the unittest-style tests access to pytest's monkeypatch fixture
+        self.monkeypatch = monkeypatch
+
     def test_index_route(self):
         """Test that the index route returns 200 OK"""
         response = self.client.get('/')
         self.assertEqual(response.status_code, 200)
     
-    @patch('mock_services.mock_fetch_newsapi')
-    def test_search_with_valid_query(self, mock_fetch):
+    def test_search_with_valid_query(self):
         """Test search with a valid query"""
         # Configure the mock to return mock articles
-        mock_fetch.return_value = MOCK_ARTICLES
+        self.monkeypatch.setattr('mock_services.mock_fetch_newsapi', MagicMock(return_value=MOCK_ARTICLES))
         
         response = self.client.post('/data', data={'event': 'climate change'})
         self.assertEqual(response.status_code, 200)
         
         # Check if response contains expected data
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertIn('articles', data)
         self.assertIn('summary', data)
     
@@ -89,8 +83,7 @@ class TestNeutralNewsApp(unittest.TestCase):
         response = self.client.post('/data', data={'event': ''})
         self.assertEqual(response.status_code, 400)
     
-    @patch('mock_services.mock_fetch_newsapi')
-    def test_newsapi_integration(self, mock_fetch):
+    def test_newsapi_integration(self):
         """Test NewsAPI integration with mocked response"""
         # Configure the mock to return different results based on the query
         def side_effect(query, *args, **kwargs):
@@ -100,7 +93,8 @@ class TestNeutralNewsApp(unittest.TestCase):
                 # Return default mock articles for other queries (trending topics)
                 return MOCK_ARTICLES
                 
-        mock_fetch.side_effect = side_effect
+        mock_fetch = MagicMock(side_effect=side_effect)
+        self.monkeypatch.setattr('mock_services.mock_fetch_newsapi', mock_fetch)
         
         # Make the request
         response = self.client.post('/data', data={'event': 'test query'})
@@ -110,7 +104,7 @@ class TestNeutralNewsApp(unittest.TestCase):
         mock_fetch.assert_any_call('test query', None, 7, 10)
         
         # Check response content
-        data = json.loads(response.data)
+        data = response.get_json()
         self.assertIn('articles', data)
         self.assertEqual(len(data['articles']), 20)
     
@@ -120,31 +114,20 @@ class TestNeutralNewsApp(unittest.TestCase):
         pass
 
 # Pytest-style tests
-@pytest.fixture
-def client():
-    """Flask test client fixture"""
-    # Create a test client without using pytest-flask
-    app.config['TESTING'] = True
-    with app.test_client() as client:
-        # Establish an application context
-        with app.app_context():
-            yield client
-
-@patch('mock_services.mock_fetch_newsapi')
-def test_index_page_pytest(mock_fetch, client):
+def test_index_page_pytest(monkeypatch, client):
     """Test index page using pytest style"""
+    monkeypatch.setattr('mock_services.mock_fetch_newsapi', MagicMock())
     response = client.get('/')
     assert response.status_code == 200
 
-@patch('mock_services.mock_fetch_newsapi')
-def test_search_functionality_pytest(mock_fetch, client):
+def test_search_functionality_pytest(monkeypatch, client):
     """Test search functionality using pytest style"""
     # Configure the mock to return mock articles
-    mock_fetch.return_value = MOCK_ARTICLES
+    monkeypatch.setattr('mock_services.mock_fetch_newsapi', MagicMock(return_value=MOCK_ARTICLES))
     
     response = client.post('/data', data={'event': 'technology'})
     assert response.status_code == 200
-    data = json.loads(response.data)
+    data = response.get_json()
     assert 'articles' in data
     assert len(data['articles']) > 0
 
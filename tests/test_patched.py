@@ -1,29 +1,27 @@
 import unittest
 import pytest
-import json
-import os
-import sys
 import logging
-from unittest.mock import patch, MagicMock
-
-# Add the parent directory to sys.path to import application modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from unittest.mock import MagicMock
 
 # Import mock modules for testing
-from mock_services import patch_modules, mock_fetch_newsapi
+pytest.importorskip("mock_data")
 from mock_data import MOCK_ARTICLES
 
-# Patch modules before importing app
-patch_modules()
+def normalize_source(article):
+    """Return the article with its source flattened to a name, copying it only if that changes it"""
+    source = article.get('source')
+    if isinstance(source, dict) and 'name' in source:
+        return {**article, 'source': source['name']}
+    if source is None:
+        return {**article, 'source': 'Unknown'}
+    return article
 
-# Import application modules after patching
-import app_test
-from app_test import app
-import routes
+# MOCK_ARTICLES with normalized sources, built once at import
+MOCK_ARTICLES_NORMALIZED = tuple(normalize_source(article) for article in MOCK_ARTICLES)
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
+# Keep test logging quiet; the debug output below is only formatted when DEBUG is enabled
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.WARNING)
 
 # Create a simple monkey patch for the routes module
 # Instead of trying to modify dict methods, we'll create a wrapper function
@@ -48,39 +46,21 @@ def patched_fetch_and_process_data(event):
     """
     A patched version of _fetch_and_process_data that normalizes source fields
     """
-    import routes
     from mock_services import mock_fetch_newsapi
     
-    logger.debug(f"Patched fetch and process called with event: {event}")
+    logger.debug("Patched fetch and process called with event: %s", event)
     
     # Get articles from the mock service
     articles = mock_fetch_newsapi(event)
     
     # Log the structure of the first few articles to understand their format
-    for i, article in enumerate(articles[:3]):
-        logger.debug(f"Article {i} structure: {article}")
-        logger.debug(f"Article {i} source type: {type(article.get('source'))}")
-        logger.debug(f"Article {i} source value: {article.get('source')}")
+    if logger.isEnabledFor(logging.DEBUG):
+        for i, article in enumerate(articles[:3]):
+            logger.debug("Article %d structure: %s", i, article)
+            logger.debug("Article %d source type=%s val=%s", i, type(article.get('source')), article.get('source'))
     
     # Normalize the source field in each article
-    normalized_articles = []
-    for article in articles:
-        article_copy = article.copy()
-        source = article_copy.get('source')
-        
-        # Log before normalization
-        logger.debug(f"Before normalization - source: {source}, type: {type(source)}")
-        
-        # Normalize the source field
-        if isinstance(source, dict) and 'name' in source:
-            article_copy['source'] = source['name']
-        elif source is None:
-            article_copy['source'] = 'Unknown'
-            
-        # Log after normalization
-        logger.debug(f"After normalization - source: {article_copy['source']}, type: {type(article_copy['source'])}")
-        
-        normalized_articles.append(article_copy)
+    normalized_articles = [normalize_source(article) for article in articles]
     
     # Now process these normalized articles using the original logic
     # but skip the fetching part since we've already done that
@@ -88,65 +68,39 @@ def patched_fetch_and_process_data(event):
         # Call the rest of the processing pipeline with normalized articles
         # This is a simplified version - in reality, we'd need to replicate the full processing
         logger.debug("Processing normalized articles")
-        processed_data = {
-            'articles': normalized_articles,
-            'summary': "This is a mock summary for testing purposes.",
-            'sentiment': {'score': 0.5, 'label': 'neutral'}
-        }
-        return processed_data
+        return "This is a mock summary for testing purposes.", normalized_articles, None
     except Exception as e:
         logger.error(f"Error in patched_fetch_and_process_data: {str(e)}", exc_info=True)
-        # Return a minimal valid response to prevent test failures
-        return {
-            'articles': [],
-            'summary': "Error occurred during processing.",
-            'sentiment': {'score': 0, 'label': 'neutral'}
-        }
+        # Report the failure in the error slot, the same shape _fetch_and_process_data uses
+        return None, None, f"Error processing request: {str(e)}"
 
+@pytest.mark.usefixtures("class_client")
 class TestPatchedApp(unittest.TestCase):
-    def setUp(self):
-        # Set up Flask test client
-        self.client = app.test_client()
-        self.client.testing = True
-        
+    @pytest.fixture(autouse=True)
+    def _monkeypatch(self, monkeypatch):
+        # Give the unittest-style tests access to pytest's monkeypatch fixture
+        self.monkeypatch = monkeypatch
+
     def test_index_route(self):
         """Test the index route"""
         response = self.client.get('/')
         self.assertEqual(response.status_code, 200)
         
-    @patch('mock_services.mock_fetch_newsapi')
-    def test_search_with_valid_query(self, mock_fetch):
+    def test_search_with_valid_query(self):
         """Test search with a valid query"""
         # Configure the mock to return mock articles with normalized sources
-        articles = []
-        for article in MOCK_ARTICLES:
-            article_copy = article.copy()
-            source = article_copy.get('source')
-            
-            # Log the source before modification
-            logger.debug(f"Original source in test: {source}, type: {type(source)}")
-            
-            # Normalize the source
-            if isinstance(source, dict) and 'name' in source:
-                article_copy['source'] = source['name']
-            elif source is None:
-                article_copy['source'] = 'Unknown'
-                
-            # Log the source after modification
-            logger.debug(f"Normalized source in test: {article_copy['source']}, type: {type(article_copy['source'])}")
-            
-            articles.append(article_copy)
+        articles = list(MOCK_ARTICLES_NORMALIZED)
         
-        mock_fetch.return_value = articles
+        self.monkeypatch.setattr('mock_services.mock_fetch_newsapi', MagicMock(return_value=articles))
         
         # Log what we're returning from the mock
-        logger.debug(f"Mock configured to return {len(articles)} articles")
+        logger.debug("Mock configured to return %d articles", len(articles))
         if articles:
-            logger.debug(f"First article source: {articles[0].get('source')}, type: {type(articles[0].get('source'))}")
+            logger.debug("First article source type=%s val=%s", type(articles[0].get('source')), articles[0].get('source'))
         
         response = self.client.post('/data', data={'event': 'climate change'})
-        logger.debug(f"Response status: {response.status_code}")
-        logger.debug(f"Response data: {response.data}")
+        logger.debug("Response status: %s", response.status_code)
+        logger.debug("Response data: %s", response.data)
         self.assertEqual(response.status_code, 200)
         
     def test_search_with_empty_query(self):
@@ -1,23 +1,23 @@
 import unittest
-import json
-import os
-import sys
-from unittest.mock import patch, MagicMock
-
-# Add the parent directory to the path so we can import the app modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import pytest
+from unittest.mock import MagicMock
 
+pytest.importorskip("mock_services")
 from app import app
-from mock_services import MOCK_ARTICLES
 
 class TestSourceHandling(unittest.TestCase):
-    def setUp(self):
-        # Set up Flask test client
-        self.client = app.test_client()
-        self.client.testing = True
-        
-    @patch('routes._fetch_and_process_data')
-    def test_dictionary_source_handling(self, mock_fetch_process):
+    @classmethod
+    def setUpClass(cls):
+        # Set up one Flask test client shared by every test in the class
+        cls.client = app.test_client()
+        cls.client.testing = True
+
+    @pytest.fixture(autouse=True)
+    def _monkeypatch(self, monkeypatch):
+        # Give the unittest-style tests access to pytest's monkeypatch fixture
+        self.monkeypatch = monkeypatch
+
+    def test_dictionary_source_handling(self):
         """Test that dictionary sources are properly handled"""
         # Create test articles with dictionary sources
         test_articles = [
@@ -49,41 +49,30 @@ class TestSourceHandling(unittest.TestCase):
             }
         ]
         
-        # Configure the mock to return our test data
-        def side_effect(query):
-            if query == 'test query':
-                return {
-                    'articles': test_articles,
-                    'summary': 'Test summary',
-                    'sentiment': {'score': 0.1, 'label': 'neutral'}
-                }
-            else:
-                # Return default mock data for trending topics
-                return {
-                    'articles': MOCK_ARTICLES,
-                    'summary': f'Summary for {query}',
-                    'sentiment': {'score': 0.0, 'label': 'neutral'}
-                }
-                
-        mock_fetch_process.side_effect = side_effect
+        # Have every news source return our test data, so the dictionary sources go through the pipeline
+        mock_fetch_standardize = MagicMock(side_effect=lambda fetcher, event, source: [dict(article) for article in test_articles])
+        self.monkeypatch.setattr('routes.fetch_and_standardize', mock_fetch_standardize)
+        self.monkeypatch.setattr('routes.summarize_articles', MagicMock(return_value='Test summary'))
         
         # Make a request to the data endpoint
-        response = self.client.post('/data', data={'event': 'test query'})
+        response = self.client.post('/data', data={'event': 'test source handling'})
         
         # Check that the response is successful
         self.assertEqual(response.status_code, 200)
         
         # Parse the response data
-        data = json.loads(response.data)
+        data = response.get_json()
         
         # Check that the articles are included in the response
         self.assertIn('articles', data)
         
-        # Verify that the mock was called with the expected arguments
-        mock_fetch_process.assert_any_call('test query')
+        # Verify that the sources were fetched for the expected event
+        self.assertTrue(mock_fetch_standardize.called)
+        for call in mock_fetch_standardize.call_args_list:
+            self.assertEqual(call.args[1], 'test source handling')
         
         # Check that the source field is properly handled in the response
-        # The source should be normalized in the routes.py file
+        # The source should be normalized by the pipeline in routes.py
         for article in data['articles']:
             self.assertIn('source', article)
             # Source should be a string (the name extracted from the dictionary)
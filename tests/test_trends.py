@@ -0,0 +1,24 @@
+import pytest
+import trends
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Serve the given topics as the Google Trends response, bypassing the disk cache"""
+    def serve(topics):
+        async def fetch():
+            return iter(topics)
+        monkeypatch.setattr(trends, '_fetch_trends_async', fetch)
+    monkeypatch.setattr(trends, 'get_cached_topics', lambda: None)
+    monkeypatch.setattr(trends, 'save_cached_topics', lambda topics: None)
+    return serve
+
+def test_padding_uses_defaults_in_order(fetched):
+    fetched(["Moon Landing"])
+    assert trends.fetch_trending_topics(3) == ["Moon Landing", "Climate Change", "Artificial Intelligence"]
+
+def test_padding_skips_fetched_defaults(fetched):
+    """A fetched topic that is also a default is not repeated by the padding"""
+    fetched(["Climate Change", "Moon Landing"])
+    topics = trends.fetch_trending_topics(4)
+    assert topics == ["Climate Change", "Moon Landing", "Artificial Intelligence", "Elections"]
+    assert len(set(topics)) == 4
@@ -1,164 +1,360 @@
-from pytrends.request import TrendReq
+import asyncio
+import atexit
+import collections
 import logging
-import traceback
-import inspect
-import sys
 import os
-import json
 import random
-from datetime import datetime, timedelta
+from itertools import islice
+import threading
+import time
+from importlib import metadata
+
+import aiohttp
+import orjson
 
 logger = logging.getLogger(__name__)
 
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'not installed'
+
+# Log the HTTP client version once, when the module is loaded
+_VERSIONS = {name: _package_version(name) for name in ('aiohttp',)}
+logger.info("Using aiohttp v%s", _VERSIONS['aiohttp'])
+
 # Default trending topics as a robust fallback
-DEFAULT_TOPICS = [
+DEFAULT_TOPICS = (
     "Climate Change", "Artificial Intelligence", "Elections", 
     "Global Economy", "Healthcare", "Renewable Energy",
     "Technology", "Education", "Politics", "Space Exploration",
     "Social Media", "Cryptocurrency", "Stock Market",
     "Remote Work", "Cybersecurity", "Vaccine", "Mental Health"
-]
+)
+
+# The stable anchors and random pool of the fallback topics, sliced once at import
+_FALLBACK_ANCHORS = DEFAULT_TOPICS[:2]
+_FALLBACK_POOL = DEFAULT_TOPICS[2:]
+# How long one random selection of fallback topics stays in place
+FALLBACK_ROTATION_SECONDS = 3600
+
+# Live Google Trends lookups are opt-in; without them the homepage uses the fallback topics
+USE_GOOGLE_TRENDS = os.environ.get('USE_GOOGLE_TRENDS', 'False') in ('true', 'True', '1')
+# TRENDS_OFFLINE overrides it, e.g. for test runs and local development without network access
+TRENDS_OFFLINE = os.environ.get('TRENDS_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+# Google Trends is polled by a background thread so requests never wait on it; until its
+# first fetch succeeds, get_trending_topics serves the fallback topics
+TRENDS_REFRESH_SECONDS = 600
+TRENDS_TOPIC_COUNT = 10
+_latest_topics = None
+_refresh_thread = None
+_refresh_lock = threading.Lock()
+
+# Circuit breaker around Google Trends: after BREAKER_FAILURE_THRESHOLD consecutive failed refreshes the
+# circuit opens and refreshes are skipped for BREAKER_COOLDOWN_SECONDS; the next refresh is a single
+# HALF_OPEN probe that closes the circuit on success or reopens it on failure
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 1800
+_breaker = {'state': 'CLOSED', 'fails': 0, 'opened_at': 0.0}
+
+# Per-limit memo of the topics handed to callers as {limit: (monotonic time, topics)}; entries expire
+# after TOPICS_MEMO_SECONDS and are dropped whenever the refresh thread publishes new topics
+TOPICS_MEMO_SECONDS = TRENDS_REFRESH_SECONDS
+_MEM_CACHE = {}
+_mem_cache_lock = threading.Lock()
+# Bumped with every publish, so a selection made from older topics is not memoized after the clear
+_topics_generation = 0
+
+# Google Trends daily trending searches for the US, the feed pytrends' trending_searches wrapped
+TRENDS_URL = "https://trends.google.com/trends/api/dailytrends"
+TRENDS_PARAMS = {'hl': 'en-US', 'tz': '360', 'geo': 'US', 'ns': '15'}
+# Google prefixes its JSON responses with this to block cross-site script inclusion
+XSSI_PREFIX = ")]}',"
+
+# Client-side rate limit on Google Trends requests, well under the point where Google starts
+# throttling the IP: at most TRENDS_MAX_REQUESTS requests per TRENDS_RATE_PERIOD seconds
+TRENDS_MAX_REQUESTS = 2
+TRENDS_RATE_PERIOD = 60
+_request_times = collections.deque()
+_rate_lock = threading.Lock()
+
+# One event loop and aiohttp session reused by every fetch, so retries and later refreshes can
+# reuse the pooled connection to trends.google.com instead of paying a new TCP+TLS handshake
+_loop = None
+_session = None
+_loop_lock = threading.Lock()
 
-# Path for cached topics file
-CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cached_trends.json")
+# Retries of transient Google Trends failures use full-jitter exponential backoff
+TRENDS_MAX_ATTEMPTS = 3
+# Hard deadline on each Google Trends request (connect, send and read), so a stalled upstream
+# fails fast as a retryable timeout instead of hanging the refresh
+TRENDS_TIMEOUT = aiohttp.ClientTimeout(total=3.0, connect=1.0)
+RETRY_BASE_SECONDS = 0.5
+RETRY_CAP_SECONDS = 30
 
-def get_cached_topics(max_age_hours=24):
+# Path for cached topics file, under the user cache directory rather than the (possibly read-only)
+# code directory; the directory is created on first save
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'neutralnews')
+CACHE_FILE = os.path.join(CACHE_DIR, "cached_trends.json")
+
+# How long fetched topics stay valid on disk; Google Trends changes roughly daily
+TRENDS_TTL_HOURS = float(os.environ.get('TRENDS_TTL_HOURS', 12))
+
+def get_cached_topics(max_age_hours=None):
     """Get cached trending topics if available and not too old"""
-    return None
-    # try:
-    #     if os.path.exists(CACHE_FILE):
-    #         with open(CACHE_FILE, 'r') as f:
-    #             cache_data = json.load(f)
-                
-    #         timestamp = cache_data.get('timestamp')
-    #         topics = cache_data.get('topics')
-            
-    #         # Check if cache is valid
-    #         if timestamp and topics:
-    #             cache_time = datetime.fromtimestamp(timestamp)
-    #             if datetime.now() - cache_time < timedelta(hours=max_age_hours):
-    #                 logger.info(f"Using cached trends from {cache_time}")
-    #                 return topics
-    #             else:
-    #                 logger.info(f"Cached trends are too old ({cache_time})")
-    #     return None
-    # except Exception as e:
-    #     logger.error(f"Error reading cached topics: {e}")
-    #     return None
-
-def save_cached_topics(topics):
+    try:
+        if os.path.exists(CACHE_FILE):
+            with open(CACHE_FILE, 'rb') as f:
+                cache_data = orjson.loads(f.read())
+
+            timestamp = cache_data.get('timestamp')
+            topics = cache_data.get('topics')
+            if max_age_hours is not None:
+                ttl_seconds = max_age_hours * 3600
+            else:
+                ttl_seconds = cache_data.get('ttl_seconds', TRENDS_TTL_HOURS * 3600)
+
+            # Check if cache is valid
+            if timestamp and topics:
+                age = time.time() - timestamp
+                if age < ttl_seconds:
+                    logger.info("Using cached trends from %.0fs ago", age)
+                    return topics
+                else:
+                    logger.info("Cached trends are too old (%.0fs)", age)
+        return None
+    except orjson.JSONDecodeError as e:
+        logger.warning("Ignoring unreadable cached topics: %s", e)
+        return None
+    except Exception as e:
+        logger.error("Error reading cached topics: %s", e)
+        return None
+
+def save_cached_topics(topics, ttl_seconds=None):
     """Save topics to cache file"""
     try:
         cache_data = {
-            'timestamp': datetime.now().timestamp(),
-            'topics': topics
+            'timestamp': time.time(),
+            'topics': topics,
+            'ttl_seconds': ttl_seconds if ttl_seconds is not None else TRENDS_TTL_HOURS * 3600
         }
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
-        
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache_data, f)
-        logger.info(f"Saved {len(topics)} topics to cache")
+
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename it into place, so readers see the old file or the new one,
+        # never a truncated one
+        tmp_file = f"{CACHE_FILE}.tmp.{os.getpid()}"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(cache_data))
+        os.replace(tmp_file, CACHE_FILE)
+        logger.info("Saved %d topics to cache", len(topics))
     except Exception as e:
-        logger.error(f"Error saving cached topics: {e}")
+        logger.error("Error saving cached topics: %s", e)
 
 def get_fallback_topics(limit=4):
     """Get a mix of predefined topics, some randomized to create variety"""
-    # Use the first 2 as stable anchors
-    stable_topics = DEFAULT_TOPICS[:2]
-    
-    # Randomly select the rest to provide variety
-    variable_topics = random.sample(DEFAULT_TOPICS[2:], min(limit-2, len(DEFAULT_TOPICS)-2))
-    
-    result = stable_topics + variable_topics
-    logger.info(f"Using fallback topics with randomization: {result[:limit]}")
-    return result[:limit]
+    # Use the first 2 as stable anchors and randomly select the rest to provide variety,
+    # sampling straight into the result list
+    result = list(_FALLBACK_ANCHORS[:limit])
+    picks = limit - len(result)
+    if picks > 0:
+        # Seeded by the hour, so every worker picks the same topics for an hour at a time and
+        # the summaries cached for them keep getting hit
+        rng = random.Random(int(time.time()) // FALLBACK_ROTATION_SECONDS)
+        result += rng.sample(_FALLBACK_POOL, min(picks, len(_FALLBACK_POOL)))
+    logger.debug("Using fallback topics with randomization: %s", result)
+    return result
+
+def parse_daily_trends(body):
+    """Iterate over the search queries in a dailytrends response body, in ranking order"""
+    if body.startswith(XSSI_PREFIX):
+        body = body[len(XSSI_PREFIX):]
+    data = orjson.loads(body)
+    days = data.get('default', data).get('trendingSearchesDays') or []
+    searches = days[0].get('trendingSearches', []) if days else []
+    return (search['title']['query'] for search in searches)
+
+def _reserve_request_slot():
+    """Reserve the next Google Trends request slot and return how many seconds to wait for it"""
+    with _rate_lock:
+        now = time.monotonic()
+        while _request_times and now - _request_times[0] >= TRENDS_RATE_PERIOD:
+            _request_times.popleft()
+        start = now
+        if len(_request_times) >= TRENDS_MAX_REQUESTS:
+            # The slot opens once the request TRENDS_MAX_REQUESTS back leaves the window
+            start = max(now, _request_times[-TRENDS_MAX_REQUESTS] + TRENDS_RATE_PERIOD)
+        _request_times.append(start)
+        return start - now
+
+def _get_session():
+    """Return the shared aiohttp session, creating it on the current (shared) event loop"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit_per_host=4), timeout=TRENDS_TIMEOUT)
+    return _session
+
+def _run(coro):
+    """Run a coroutine to completion on the module's shared event loop"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+        return _loop.run_until_complete(coro)
+
+@atexit.register
+def _close_session():
+    if _session is None or _session.closed:
+        return
+    # A refresh can hold the loop for up to a minute while rate limited; don't hold up shutdown for it
+    if not _loop_lock.acquire(timeout=1):
+        logger.debug("Trends refresh still running at exit, not closing its session")
+        return
+    try:
+        _loop.run_until_complete(_session.close())
+    finally:
+        _loop_lock.release()
+
+async def _request_daily_trends():
+    """Make one rate-limited dailytrends request and return the response body"""
+    delay = _reserve_request_slot()
+    if delay > 0:
+        logger.info("Rate limiting Google Trends request for %.1fs", delay)
+        await asyncio.sleep(delay)
+    session = _get_session()
+    async with session.get(TRENDS_URL, params=TRENDS_PARAMS) as response:
+        response.raise_for_status()
+        return await response.text()
+
+def _is_transient(error):
+    """Only throttling, server errors and connection problems are worth retrying"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+async def _fetch_trends_async():
+    """Fetch the current trending searches from Google Trends, retrying transient failures"""
+    for attempt in range(TRENDS_MAX_ATTEMPTS):
+        try:
+            body = await _request_daily_trends()
+            break
+        except Exception as e:
+            if attempt == TRENDS_MAX_ATTEMPTS - 1 or not _is_transient(e):
+                raise
+            # Full jitter: a random wait up to the capped exponential backoff, so retries from
+            # several workers or replicas spread out instead of arriving together
+            delay = random.uniform(0, min(RETRY_CAP_SECONDS, RETRY_BASE_SECONDS * 2 ** attempt))
+            logger.warning("Google Trends request failed (%s), retrying in %.1fs", e, delay)
+            await asyncio.sleep(delay)
+    return parse_daily_trends(body)
+
+def fetch_trending_topics(limit=4):
+    """Fetch trending searches from Google Trends, padded with fallbacks if too few are usable"""
+    # First check if we have valid cached topics
+    cached_topics = get_cached_topics()
+    if cached_topics:
+        return cached_topics[:limit]
+
+    logger.info("Attempting to fetch trending searches from Google Trends")
+    topics = _run(_fetch_trends_async())
+
+    # Process the topics in a single pass, stopping as soon as limit usable ones are found
+    cleaned_topics = list(islice((stripped for topic in topics if len(stripped := topic.strip()) > 3), limit))
+    logger.debug("Cleaned trending topics: %s", cleaned_topics)
+    needed = limit - len(cleaned_topics)
+    if needed > 0:
+        logger.warning("Fetched only %d valid topics, padding with fallbacks", len(cleaned_topics))
+        # Skip defaults that were fetched anyway, so the padding never repeats a topic
+        fetched = {topic.casefold() for topic in cleaned_topics}
+        cleaned_topics.extend(islice((topic for topic in DEFAULT_TOPICS if topic.casefold() not in fetched), needed))
+    logger.info("Final trending topics: %s", cleaned_topics)
+
+    # Cache the successful results
+    save_cached_topics(cleaned_topics)
+
+    return cleaned_topics
+
+def _breaker_allows_request():
+    """Whether the circuit breaker lets a Google Trends fetch through right now"""
+    if _breaker['state'] == 'OPEN':
+        if time.monotonic() - _breaker['opened_at'] < BREAKER_COOLDOWN_SECONDS:
+            return False
+        _breaker['state'] = 'HALF_OPEN'
+    return True
+
+def _record_fetch_result(succeeded):
+    if succeeded:
+        if _breaker['state'] != 'CLOSED':
+            logger.info("Google Trends is reachable again, closing the circuit")
+        _breaker.update(state='CLOSED', fails=0)
+        return
+    _breaker['fails'] += 1
+    if _breaker['state'] == 'HALF_OPEN' or _breaker['fails'] >= BREAKER_FAILURE_THRESHOLD:
+        logger.warning("Google Trends failed %d times in a row, skipping it for %ds",
+                       _breaker['fails'], BREAKER_COOLDOWN_SECONDS)
+        _breaker.update(state='OPEN', opened_at=time.monotonic())
+
+def refresh_trending_topics():
+    """Fetch trending topics and publish them for get_trending_topics; keeps the last value on failure"""
+    global _latest_topics, _topics_generation
+    if not _breaker_allows_request():
+        logger.debug("Google Trends circuit is open, skipping refresh")
+        return
+    try:
+        topics = fetch_trending_topics(TRENDS_TOPIC_COUNT)
+    except Exception as e:
+        _record_fetch_result(False)
+        # exc_info leaves rendering the traceback to the handler
+        logger.error("Error fetching trends: %s: %s", type(e).__name__, e, exc_info=True)
+        return
+    _record_fetch_result(True)
+    with _mem_cache_lock:
+        _latest_topics = topics
+        _topics_generation += 1
+        _MEM_CACHE.clear()
+
+def _refresh_loop():
+    while True:
+        refresh_trending_topics()
+        time.sleep(TRENDS_REFRESH_SECONDS)
+
+def start_trends_refresh():
+    """Start the background refresh thread once per process.
+
+    Called lazily from the request path rather than at import so that each gunicorn worker
+    (and only the serving process under the Flask reloader) gets its own thread after forking.
+    """
+    global _refresh_thread
+    with _refresh_lock:
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(target=_refresh_loop, name="trends-refresh", daemon=True)
+            _refresh_thread.start()
+            logger.info("Started trending topics refresh every %ds", TRENDS_REFRESH_SECONDS)
 
 def get_trending_topics(limit=4):
-    # Use fallback topics since Google Trends failed
-    fallback_topics = get_fallback_topics(limit)
-    logger.info(f"Using fallback topics: {fallback_topics}")
-    return fallback_topics
-    # # First check if we have valid cached topics
-    # cached_topics = get_cached_topics()
-    # if cached_topics:
-    #     return cached_topics[:limit]
-    
-    # try:
-    #     # Log pytrends and requests versions
-    #     import pkg_resources
-    #     try:
-    #         pytrends_version = pkg_resources.get_distribution('pytrends').version
-    #         requests_version = pkg_resources.get_distribution('requests').version
-    #         urllib3_version = pkg_resources.get_distribution('urllib3').version
-    #         logger.info(f"Using pytrends v{pytrends_version}, requests v{requests_version}, urllib3 v{urllib3_version}")
-    #     except Exception as pkg_err:
-    #         logger.warning(f"Failed to get package versions: {pkg_err}")
-        
-    #     # First, try the patched approach for newer urllib3 versions
-    #     try:
-    #         # Try to patch the urllib3.util.retry module to handle the parameter name change
-    #         import urllib3.util.retry
-    #         original_init = urllib3.util.retry.Retry.__init__
-            
-    #         def patched_init(self, *args, **kwargs):
-    #             # Convert method_whitelist to allowed_methods for newer urllib3 versions
-    #             if 'method_whitelist' in kwargs and not hasattr(urllib3.util.retry.Retry, 'method_whitelist'):
-    #                 logger.info("Patching urllib3.util.retry.Retry to handle method_whitelist parameter")
-    #                 kwargs['allowed_methods'] = kwargs.pop('method_whitelist')
-    #             original_init(self, *args, **kwargs)
-                
-    #         # Apply the patch
-    #         urllib3.util.retry.Retry.__init__ = patched_init
-    #         logger.info("Successfully patched urllib3.util.retry.Retry.__init__")
-            
-    #         logger.info("Creating TrendReq instance with patched urllib3...")
-    #         pytrends = TrendReq(hl='en-US', tz=360, retries=3, backoff_factor=2)
-            
-    #         logger.info("Attempting to fetch trending searches from Google Trends")
-    #         trending = pytrends.trending_searches(pn='united_states')
-    #         topics = trending[0].tolist()[:limit]
-    #         logger.info(f"Raw trending topics fetched: {topics}")
-    #     except Exception as patch_error:
-    #         # If patching fails, try directly with minimal parameters
-    #         logger.warning(f"Patched approach failed: {patch_error}. Trying direct approach...")
-    #         logger.info("Creating TrendReq instance with minimal parameters...")
-    #         pytrends = TrendReq(hl='en-US', tz=360)  # Skip retry parameters
-            
-    #         logger.info("Attempting to fetch trending searches without retries")
-    #         trending = pytrends.trending_searches(pn='united_states')
-    #         topics = trending[0].tolist()[:limit]
-    #         logger.info(f"Raw trending topics fetched with direct approach: {topics}")
-            
-    #     # Process the topics
-    #     cleaned_topics = [topic.strip() for topic in topics if len(topic.strip()) > 3]
-    #     if len(cleaned_topics) < limit:
-    #         logger.warning(f"Fetched only {len(cleaned_topics)} valid topics, padding with fallbacks")
-    #         cleaned_topics.extend(get_fallback_topics(limit)[:limit - len(cleaned_topics)])
-    #     final_topics = cleaned_topics[:limit]
-    #     logger.info(f"Final trending topics: {final_topics}")
-        
-    #     # Cache the successful results
-    #     save_cached_topics(final_topics)
-        
-    #     return final_topics
-    # except Exception as e:
-    #     logger.error(f"Error fetching trends: {e}")
-        
-    #     # More detailed error logging
-    #     logger.error(f"Exception type: {type(e).__name__}")
-    #     logger.error(f"Exception details: {str(e)}")
-    #     logger.error(f"Traceback:\n{traceback.format_exc()}")
-        
-    #     # Try to get more information about the TrendReq constructor
-    #     try:
-    #         constructor_args = inspect.signature(TrendReq.__init__)
-    #         logger.error(f"TrendReq constructor expected arguments: {constructor_args}")
-    #     except Exception as inspect_err:
-    #         logger.error(f"Failed to inspect TrendReq: {inspect_err}")
-        
-    #     # Use fallback topics since Google Trends failed
-    #     fallback_topics = get_fallback_topics(limit)
-    #     logger.info(f"Using fallback topics: {fallback_topics}")
-    #     return fallback_topics
\ No newline at end of file
+    """Return the last fetched trending topics without blocking, or fallback topics until there are any.
+
+    Results are memoized per limit for TOPICS_MEMO_SECONDS, so the fallback selection stays stable
+    between refreshes and the homepage keeps hitting the summary cache. Each call returns a fresh list.
+    """
+    # Reads need no lock: a single dict lookup is atomic in CPython
+    entry = _MEM_CACHE.get(limit)
+    if entry and time.monotonic() - entry[0] < TOPICS_MEMO_SECONDS:
+        return list(entry[1])
+
+    generation = _topics_generation
+    topics = None
+    if USE_GOOGLE_TRENDS and not TRENDS_OFFLINE:
+        start_trends_refresh()
+        latest = _latest_topics
+        if latest and len(latest) >= limit:
+            topics = latest[:limit]
+    if topics is None:
+        # Use fallback topics since Google Trends is disabled, offline or has not been fetched yet
+        topics = get_fallback_topics(limit)
+
+    with _mem_cache_lock:
+        if generation == _topics_generation:
+            _MEM_CACHE[limit] = (time.monotonic(), tuple(topics))
+    return topics